@@ -31,13 +31,18 @@ SKIP_EXISTING=true
 USE_TRASH=true
 TRASH_DIR=""
 MAX_SIZE_BYTES=0
+TRASH_INPUT_ROOT=""  # Normalized roots used to categorize trashed files,
+TRASH_OUTPUT_ROOT="" # computed once after argument parsing
 
 # --- File Collection Cache ---
 # Arrays to hold pre-collected file data (populated once, used by all phases)
 declare -a SIZE_LIMIT_FILES=()      # Files eligible for size-based cleanup
 declare -a TRASH_CLEANUP_FILES=()   # Files in trash older than trash age
 declare -a MAIN_PROCESSING_FILES=() # Files for main processing (archive/delete)
+declare -A REMOVED_FILES=()         # Paths already disposed of by an earlier phase
+declare -A CREATED_DIRS=()          # Destination directories already created this run
 TOTAL_FILE_COUNT=0
+MAIN_VIDEO_COUNT=0 # Videos in MAIN_PROCESSING_FILES, counted during collection
 
 # --- Progress State ---
 IS_INTERACTIVE=false
@@ -76,7 +81,7 @@ log_warn() { _log "WARN" "\033[1;33m" 2 "$*"; }
 log_error() { _log "ERROR" "\033[0;31m" 2 "$*"; }
 
 # --- Progress Bar Functions ---
-format_duration() { printf "%02d:%02d:%02d" $(($1 / 3600)) $(($1 % 3600 / 60)) $(($1 % 60)); }
+format_duration() { printf -v "$1" "%02d:%02d:%02d" $(($2 / 3600)) $(($2 % 3600 / 60)) $(($2 % 60)); }
 clear_progress_line() {
   [[ "$IS_INTERACTIVE" == true ]] && printf "\r\033[K" >&2
   return 0
@@ -95,8 +100,13 @@ draw_progress_bar() {
   for ((i = 0; i < filled; i++)); do bar+="#"; done
   for ((i = 0; i < empty; i++)); do bar+="-"; done
 
+  local now file_elapsed run_elapsed
+  printf -v now '%(%s)T' -1
+  format_duration file_elapsed $((now - PROGRESS_FILE_START))
+  format_duration run_elapsed $((now - PROGRESS_RUN_START))
+
   printf "\rProgress [%d/%d] %3d%% [%s] %s (Total: %s) " \
-    "$count" "$total" "$pct" "$bar" "$(format_duration $(($(date +%s) - PROGRESS_FILE_START)))" "$(format_duration $(($(date +%s) - PROGRESS_RUN_START)))" >&2
+    "$count" "$total" "$pct" "$bar" "$file_elapsed" "$run_elapsed" >&2
 }
 
 update_progress_from_ffmpeg() {
@@ -116,46 +126,40 @@ get_file_size() { stat -f%z "$1" 2>/dev/null || stat -c%s "$1" 2>/dev/null; }
 get_video_duration() { ffprobe -v error -show_entries format=duration -of default=noprint_wrappers=1:nokey=1 "$1" 2>/dev/null | cut -d. -f1 || echo "0"; }
 get_cutoff_timestamp() { date -d "-$1 days" +%Y%m%d%H%M%S; }
 
-extract_timestamp() {
-  local base="${1%.*}"
-  local ts="${base: -14}"
-  [[ ${#ts} -eq 14 ]] && [[ "$ts" =~ ^[0-9]+$ ]] && echo "$ts" || echo ""
-}
-
-build_archive_path() { echo "${ARCHIVE_DIR}/${1:0:4}/${1:4:2}/${1:6:2}/archived-${1}.mp4"; }
+# Usage: build_archive_path VAR TIMESTAMP (assigns to VAR to avoid a subshell)
+build_archive_path() { printf -v "$1" "%s/%s/%s/%s/archived-%s.mp4" "$ARCHIVE_DIR" "${2:0:4}" "${2:4:2}" "${2:6:2}" "$2"; }
+# Usage: build_trash_path VAR FILE (assigns to VAR to avoid a subshell)
 build_trash_path() {
-  local file="$1"
+  local file="${2%/}"
 
   # Default to 'input' category (files originating from TARGET_DIR)
-  local source_root="$TARGET_DIR"
+  local source_root="$TRASH_INPUT_ROOT"
   local category="input"
 
-  # Determine the actual archive directory to check against.
-  # Use configured ARCHIVE_DIR if set, otherwise fallback to DEFAULT_ARCHIVE_DIR.
-  # This ensures we correctly categorize files even if ARCHIVE_MODE is currently off
-  # but archived files exist from previous runs.
-  local check_archive_dir="${ARCHIVE_DIR:-$DEFAULT_ARCHIVE_DIR}"
-
-  # Normalize paths for comparison (remove trailing slashes)
-  file="${file%/}"
-  check_archive_dir="${check_archive_dir%/}"
-
   # Override: switch to 'output' category for archived files.
   # We check this FIRST because ARCHIVE_DIR is often a subdirectory of TARGET_DIR,
   # and we want the more specific categorization.
-  if [[ -n "$check_archive_dir" ]] && [[ "$file" == "$check_archive_dir"* ]]; then
-    source_root="$check_archive_dir"
+  if [[ "$file" == "$TRASH_OUTPUT_ROOT"/* ]]; then
+    source_root="$TRASH_OUTPUT_ROOT"
     category="output"
-  elif [[ "$file" == "$TARGET_DIR"* ]]; then
-    # Explicitly handling input files (optional logic step, defaults handle this,
-    # but good for clarity if we wanted different logic).
-    source_root="$TARGET_DIR"
-    category="input"
   fi
 
   # Assemble path: TRASH_DIR/<category>/<relative_path>
   # where <relative_path> = '<YYYY>/<MM>/<DD>/...'
-  printf "%s/%s/%s\n" "$TRASH_DIR" "$category" "${file#"$source_root"/}"
+  printf -v "$1" "%s/%s/%s" "$TRASH_DIR" "$category" "${file#"$source_root"/}"
+}
+
+# mkdir -p once per destination directory; most files share a day folder
+ensure_dir() {
+  [[ -n "${CREATED_DIRS[$1]:-}" ]] && return 0
+  mkdir -p "$1" && CREATED_DIRS["$1"]=1
+}
+
+# Move a file to its categorized location under TRASH_DIR
+move_to_trash() {
+  local file="$1" dest
+  build_trash_path dest "$file"
+  ensure_dir "${dest%/*}" && mv "$file" "$dest"
 }
 
 rotate_logs() {
@@ -179,7 +183,9 @@ collect_all_files() {
   SIZE_LIMIT_FILES=()
   TRASH_CLEANUP_FILES=()
   MAIN_PROCESSING_FILES=()
+  REMOVED_FILES=()
   TOTAL_FILE_COUNT=0
+  MAIN_VIDEO_COUNT=0
 
   local file size filename base ts is_video location
   local find_args=()
@@ -207,7 +213,7 @@ collect_all_files() {
       base="${filename%.*}"
       ts="${base: -14}"
 
-      if [[ ${#ts} -eq 14 && "$ts" == [0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9] ]]; then
+      if [[ "$ts" == [0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9] ]]; then
         is_video="false"
         [[ "$filename" == *.mp4 || "$filename" == *.MP4 ]] && is_video="true"
 
@@ -217,7 +223,10 @@ collect_all_files() {
         # Categorize based on age
         if [[ "$ts" < "$cutoff_ts" ]]; then
           SIZE_LIMIT_FILES+=("$file|$ts|$size")
-          [[ "$location" == "input" ]] && MAIN_PROCESSING_FILES+=("$file|$ts|$size|$is_video")
+          if [[ "$location" == "input" ]]; then
+            MAIN_PROCESSING_FILES+=("$file|$ts|$size|$is_video")
+            [[ "$is_video" == true ]] && MAIN_VIDEO_COUNT=$((MAIN_VIDEO_COUNT + 1))
+          fi
         fi
 
         [[ "$location" == "trash" && "$ts" < "$trash_cutoff_ts" ]] && TRASH_CLEANUP_FILES+=("$file|$ts|$size")
@@ -229,6 +238,29 @@ collect_all_files() {
   return 0
 }
 
+# Drop entries already disposed of by an earlier phase so later phases
+# don't act on (or re-stat) files that are no longer there.
+prune_removed_files() {
+  [[ ${#REMOVED_FILES[@]} -eq 0 ]] && return
+
+  local entry
+  local -a kept=()
+  for entry in "${TRASH_CLEANUP_FILES[@]}"; do
+    [[ -n "${REMOVED_FILES[${entry%%|*}]:-}" ]] || kept+=("$entry")
+  done
+  TRASH_CLEANUP_FILES=("${kept[@]}")
+
+  kept=()
+  for entry in "${MAIN_PROCESSING_FILES[@]}"; do
+    if [[ -z "${REMOVED_FILES[${entry%%|*}]:-}" ]]; then
+      kept+=("$entry")
+    elif [[ "${entry##*|}" == true ]]; then
+      MAIN_VIDEO_COUNT=$((MAIN_VIDEO_COUNT - 1))
+    fi
+  done
+  MAIN_PROCESSING_FILES=("${kept[@]}")
+}
+
 # --- Size Utilities ---
 parse_size() {
   local input="$1"
@@ -269,18 +301,27 @@ parse_size() {
 }
 
 format_size() {
-  local bytes=$1
+  local bytes=$1 div unit
   if [[ $bytes -lt 1024 ]]; then
     echo "${bytes}B"
+    return
   elif [[ $bytes -lt 1048576 ]]; then
-    awk -v b="$bytes" 'BEGIN { printf "%.2fKiB", b/1024 }'
+    div=1024 unit="KiB"
   elif [[ $bytes -lt 1073741824 ]]; then
-    awk -v b="$bytes" 'BEGIN { printf "%.2fMiB", b/1048576 }'
+    div=1048576 unit="MiB"
   elif [[ $bytes -lt 1099511627776 ]]; then
-    awk -v b="$bytes" 'BEGIN { printf "%.2fGiB", b/1073741824 }'
+    div=1073741824 unit="GiB"
   else
-    awk -v b="$bytes" 'BEGIN { printf "%.2fTiB", b/1099511627776 }'
+    div=1099511627776 unit="TiB"
+  fi
+
+  # Fixed-point hundredths keep this in shell arithmetic instead of awk; ties
+  # round to even so the output matches printf "%.2f"
+  local hundredths=$((bytes * 100 / div)) rem=$((bytes * 100 % div))
+  if ((rem * 2 > div || (rem * 2 == div && hundredths % 2 == 1))); then
+    hundredths=$((hundredths + 1))
   fi
+  printf "%d.%02d%s" $((hundredths / 100)) $((hundredths % 100)) "$unit"
 }
 
 get_directory_size() {
@@ -289,21 +330,27 @@ get_directory_size() {
   du -sb "$dir" 2>/dev/null | cut -f1 || echo "0"
 }
 
+# Combined size of several directories from a single du walk
+get_total_size() {
+  [[ $# -eq 0 ]] && echo "0" && return
+  du -sbc "$@" 2>/dev/null | awk 'END { print $1 + 0 }' || true
+}
+
 # --- Core Logic: Transcode ---
 transcode_file() {
   local input="$1" output="$2"
 
   if [[ "$SKIP_EXISTING" == true ]] && [[ -f "$output" ]] && [[ $(get_file_size "$output") -ge $MIN_OUTPUT_SIZE_BYTES ]]; then
-    log_warn "Output exists (>= 1MB), skipping: $(basename "$output")"
+    log_warn "Output exists (>= 1MB), skipping: ${output##*/}"
     return 0
   fi
 
-  mkdir -p "$(dirname "$output")"
+  ensure_dir "${output%/*}"
   PROGRESS_FILE_START=$(date +%s)
   local duration=0
   [[ "$IS_INTERACTIVE" == true ]] && duration=$(get_video_duration "$input")
 
-  log_info "Transcoding: $(basename "$input")"
+  log_info "Transcoding: ${input##*/}"
 
   local cmd=(ffmpeg -hide_banner -hwaccel qsv -hwaccel_output_format qsv -y -i "$input"
     -vf scale_qsv=w=1024:h=768:mode=hq -global_quality 26 -c:v h264_qsv -an)
@@ -313,8 +360,12 @@ transcode_file() {
   # disable 'set -e' temporarily so we can catch failures manually
   set +e
   if [[ "$IS_INTERACTIVE" == true ]]; then
-    cmd+=(-progress pipe:1 "$output")
-    "${cmd[@]}" 2>&1 | while IFS= read -r line; do update_progress_from_ffmpeg "$duration" "$line"; done
+    # -nostats keeps the stderr status line out of the pipe; only the out_time=
+    # key of the -progress block is needed, so skip the regex for everything else
+    cmd+=(-nostats -progress pipe:1 "$output")
+    "${cmd[@]}" 2>&1 | while IFS= read -r line; do
+      case "$line" in out_time=*) update_progress_from_ffmpeg "$duration" "$line" ;; esac
+    done
     status=${PIPESTATUS[0]} # Capture exit code of ffmpeg (first command in pipe)
   else
     cmd+=("$output")
@@ -326,12 +377,12 @@ transcode_file() {
   clear_progress_line
 
   if [[ $status -ne 0 ]] || [[ ! -f "$output" ]] || [[ $(get_file_size "$output") -lt $MIN_OUTPUT_SIZE_BYTES ]]; then
-    log_error "Transcoding failed or output too small (Code: $status): $(basename "$input")"
+    log_error "Transcoding failed or output too small (Code: $status): ${input##*/}"
     rm -f "$output"
     return 1
   fi
 
-  log_success "Transcoding success: $(basename "$output")"
+  log_success "Transcoding success: ${output##*/}"
   return 0
 }
 
@@ -339,8 +390,7 @@ transcode_file() {
 dispose_file() {
   local file="$1"
   local reason="$2"
-  local file_size
-  file_size=$(get_file_size "$file")
+  local file_size="$3"
 
   if [[ "$DRY_RUN" == true ]]; then
     if [[ "$USE_TRASH" == true ]]; then
@@ -356,10 +406,7 @@ dispose_file() {
   fi
 
   if [[ "$USE_TRASH" == true ]]; then
-    local dest
-    dest=$(build_trash_path "$file")
-    mkdir -p "$(dirname "$dest")"
-    mv "$file" "$dest"
+    move_to_trash "$file"
     log "[TRASHED] $file ($reason)"
     STATS[trashed_count]=$((STATS[trashed_count] + 1))
     STATS[trashed_size]=$((STATS[trashed_size] + file_size))
@@ -376,18 +423,14 @@ dispose_file() {
 handle_archive_strategy() {
   local src="$1"
   local filename="$2"
-  local ts
-  ts=$(extract_timestamp "$filename")
+  local src_size="$3"
+  local ts="$4"
 
   local dest
-  dest=$(build_archive_path "$ts")
+  build_archive_path dest "$ts"
 
   PROGRESS_CURRENT_FILE=$((PROGRESS_CURRENT_FILE + 1))
 
-  # Calculate size once for stats
-  local src_size
-  src_size=$(get_file_size "$src")
-
   if [[ "$DRY_RUN" == true ]]; then
     log "[DRY-RUN] Would archive: $filename -> $dest"
     STATS[archived_count]=$((STATS[archived_count] + 1))
@@ -398,7 +441,7 @@ handle_archive_strategy() {
   if transcode_file "$src" "$dest"; then
     STATS[archived_count]=$((STATS[archived_count] + 1))
     STATS[archived_size]=$((STATS[archived_size] + src_size))
-    dispose_file "$src" "Archived source"
+    dispose_file "$src" "Archived source" "$src_size"
   else
     log_error "Archive failed, keeping original: $filename"
   fi
@@ -408,14 +451,15 @@ handle_archive_strategy() {
 process_file() {
   local file="$1"
   local is_video="$2"
-  local filename
-  filename=$(basename "$file")
+  local file_size="$3"
+  local ts="$4"
+  local filename="${file##*/}"
 
   if [[ "$ARCHIVE_MODE" == true ]] && [[ "$is_video" == true ]]; then
-    handle_archive_strategy "$file" "$filename"
+    handle_archive_strategy "$file" "$filename" "$file_size" "$ts"
   else
     # Images or non-archive mode
-    dispose_file "$file" "Old file"
+    dispose_file "$file" "Old file" "$file_size"
   fi
 }
 
@@ -435,12 +479,11 @@ enforce_size_limit() {
 
   # Calculate input size (year directories in TARGET_DIR)
   if [[ -d "$TARGET_DIR" ]]; then
+    local -a year_dirs=()
     for year_dir in "$TARGET_DIR"/[0-9][0-9][0-9][0-9]; do
-      [[ -d "$year_dir" ]] || continue
-      local year_size
-      year_size=$(get_directory_size "$year_dir")
-      input_size=$((input_size + year_size))
+      [[ -d "$year_dir" ]] && year_dirs+=("$year_dir")
     done
+    input_size=$(get_total_size "${year_dirs[@]}")
     log_info "Input size: $(format_size "$input_size")"
   fi
 
@@ -482,22 +525,19 @@ enforce_size_limit() {
     IFS='|' read -r file_path _ file_size <<<"$entry"
 
     if [[ "$DRY_RUN" == true ]]; then
-      log "[DRY-RUN] Would remove for size limit: $(basename "$file_path") ($(format_size "$file_size"))"
+      log "[DRY-RUN] Would remove for size limit: ${file_path##*/} ($(format_size "$file_size"))"
     else
       # Use the centralized disposal logic to respect trash settings and paths
       if [[ "$USE_TRASH" == true ]]; then
-        local dest
-        dest=$(build_trash_path "$file_path")
-        mkdir -p "$(dirname "$dest")"
-        if mv "$file_path" "$dest"; then
-          log "[SIZE-LIMIT] Trashed: $(basename "$file_path") ($(format_size "$file_size"))"
+        if move_to_trash "$file_path"; then
+          log "[SIZE-LIMIT] Trashed: ${file_path##*/} ($(format_size "$file_size"))"
         else
           log_error "Failed to trash: $file_path"
           continue # Skip stats update if move failed
         fi
       else
         if rm -f "$file_path"; then
-          log "[SIZE-LIMIT] Deleted: $(basename "$file_path") ($(format_size "$file_size"))"
+          log "[SIZE-LIMIT] Deleted: ${file_path##*/} ($(format_size "$file_size"))"
         else
           log_error "Failed to delete: $file_path"
           continue
@@ -505,6 +545,7 @@ enforce_size_limit() {
       fi
     fi
 
+    REMOVED_FILES["$file_path"]=1
     removed_size=$((removed_size + file_size))
     removed_count=$((removed_count + 1))
 
@@ -513,6 +554,8 @@ enforce_size_limit() {
     STATS[size_limit_size]=$((STATS[size_limit_size] + file_size))
   done
 
+  prune_removed_files
+
   log_success "Size-based cleanup: removed $removed_count files ($(format_size "$removed_size"))"
   log_info "New total size: $(format_size $((total_size - removed_size)))"
   echo ""
@@ -524,28 +567,46 @@ cleanup_trash_folder() {
 
   log_info "Cleaning trash folder (files older than $DEFAULT_TRASH_AGE_DAYS days)..."
 
-  local cleaned_count=0
+  local cleaned_count=0 cleaned_size=0
+  local -a purge_paths=() purge_sizes=()
 
   # TRASH_CLEANUP_FILES format: "path|timestamp|size"
   if [[ ${#TRASH_CLEANUP_FILES[@]} -gt 0 ]]; then
     for entry in "${TRASH_CLEANUP_FILES[@]}"; do
       IFS='|' read -r file_path _ file_size <<<"$entry"
 
-      if [[ "$DRY_RUN" == true ]]; then
-        log "[DRY-RUN] Would permanently delete from trash: $(basename "$file_path")"
-      else
-        rm -f "$file_path" && log "[PERMANENTLY DELETED] $(basename "$file_path")"
-      fi
+      [[ "$DRY_RUN" == true ]] && log "[DRY-RUN] Would permanently delete from trash: ${file_path##*/}"
 
+      purge_paths+=("$file_path")
+      purge_sizes+=("$file_size")
       cleaned_count=$((cleaned_count + 1))
+      cleaned_size=$((cleaned_size + file_size))
+    done
+  fi
 
-      # Track in statistics (Safe increment for set -e)
-      STATS[trash_cleanup_count]=$((STATS[trash_cleanup_count] + 1))
-      STATS[trash_cleanup_size]=$((STATS[trash_cleanup_size] + file_size))
+  # Delete in as few rm invocations as ARG_MAX allows instead of one per file
+  if [[ "$DRY_RUN" == false && ${#purge_paths[@]} -gt 0 ]]; then
+    local rm_failed=false i
+    printf '%s\0' "${purge_paths[@]}" | xargs -0 rm -f -- || rm_failed=true
+
+    for i in "${!purge_paths[@]}"; do
+      # Only on failure: check which files survived and leave them out of the totals
+      if [[ "$rm_failed" == true && -e "${purge_paths[i]}" ]]; then
+        log_error "Failed to delete from trash: ${purge_paths[i]}"
+        cleaned_count=$((cleaned_count - 1))
+        cleaned_size=$((cleaned_size - purge_sizes[i]))
+        continue
+      fi
+      log "[PERMANENTLY DELETED] ${purge_paths[i]##*/}"
     done
   fi
 
-  [[ $cleaned_count -gt 0 ]] && log_info "Cleaned $cleaned_count files from trash."
+  # Track in statistics (Safe increment for set -e)
+  STATS[trash_cleanup_count]=$((STATS[trash_cleanup_count] + cleaned_count))
+  STATS[trash_cleanup_size]=$((STATS[trash_cleanup_size] + cleaned_size))
+
+  [[ $cleaned_count -gt 0 ]] && log_info "Cleaned $cleaned_count files from trash ($(format_size "$cleaned_size"))."
+  return 0
 }
 
 remove_empty_directories() {
@@ -559,17 +620,20 @@ remove_empty_directories() {
   for scan_dir in "${dirs_to_scan[@]}"; do
     log_info "Checking for empty directories in: $scan_dir"
 
+    # -depth lists children before parents, so a single bottom-up pass is
+    # enough. rmdir refuses non-empty directories and so acts as the
+    # emptiness check itself. A dry run removes nothing, so it only reports
+    # directories that are already empty.
+    local -a find_args=("$scan_dir" -mindepth 1 -depth -type d)
+    [[ "$DRY_RUN" == true ]] && find_args+=(-empty)
+
     while IFS= read -r -d '' dir; do
-      if [[ -z "$(ls -A "$dir" 2>/dev/null)" ]]; then
-        if [[ "$DRY_RUN" == true ]]; then
-          log "[DRY-RUN] Would remove empty directory: $dir"
-        else
-          if rmdir "$dir" 2>/dev/null; then
-            log "[REMOVED] Empty directory: $dir"
-          fi
-        fi
+      if [[ "$DRY_RUN" == true ]]; then
+        log "[DRY-RUN] Would remove empty directory: $dir"
+      elif rmdir "$dir" 2>/dev/null; then
+        log "[REMOVED] Empty directory: $dir"
       fi
-    done < <(find "$scan_dir" -mindepth 1 -type d -depth -print0 2>/dev/null || true)
+    done < <(find "${find_args[@]}" -print0 2>/dev/null || true)
   done
 }
 
@@ -739,6 +803,13 @@ parse_args() {
       ;;
     esac
   done
+
+  # Use configured ARCHIVE_DIR if set, otherwise fallback to DEFAULT_ARCHIVE_DIR.
+  # This ensures we correctly categorize files even if ARCHIVE_MODE is currently off
+  # but archived files exist from previous runs.
+  TRASH_INPUT_ROOT="${TARGET_DIR%/}"
+  TRASH_OUTPUT_ROOT="${ARCHIVE_DIR:-$DEFAULT_ARCHIVE_DIR}"
+  TRASH_OUTPUT_ROOT="${TRASH_OUTPUT_ROOT%/}"
 }
 
 validate_environment() {
@@ -823,16 +894,9 @@ main() {
 
   PROGRESS_RUN_START=$(date +%s)
 
-  # Count video files for progress tracking
-  PROGRESS_TOTAL_FILES=0
-  if [[ "$ARCHIVE_MODE" == true ]] && [[ ${#MAIN_PROCESSING_FILES[@]} -gt 0 ]]; then
-    for entry in "${MAIN_PROCESSING_FILES[@]}"; do
-      IFS='|' read -r _ _ _ is_video <<<"$entry"
-      [[ "$is_video" == "true" ]] && PROGRESS_TOTAL_FILES=$((PROGRESS_TOTAL_FILES + 1))
-    done
-  else
-    PROGRESS_TOTAL_FILES=${#MAIN_PROCESSING_FILES[@]}
-  fi
+  # Video files were counted during collection for progress tracking
+  PROGRESS_TOTAL_FILES=${#MAIN_PROCESSING_FILES[@]}
+  [[ "$ARCHIVE_MODE" == true ]] && PROGRESS_TOTAL_FILES=$MAIN_VIDEO_COUNT
 
   log_info "Found ${#MAIN_PROCESSING_FILES[@]} total files ($PROGRESS_TOTAL_FILES video files to process)."
 
@@ -840,8 +904,8 @@ main() {
   if [[ ${#MAIN_PROCESSING_FILES[@]} -gt 0 ]]; then
     for entry in "${MAIN_PROCESSING_FILES[@]}"; do
       # file|ts|size|is_video
-      IFS='|' read -r file_path _ _ is_video <<<"$entry"
-      process_file "$file_path" "$is_video"
+      IFS='|' read -r file_path ts file_size is_video <<<"$entry"
+      process_file "$file_path" "$is_video" "$file_size" "$ts"
     done
   fi
 